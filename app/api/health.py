@@ -1,5 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from typing import Dict
+from ..models import NutrientPredictor
+from ..core.dependencies import get_predictor
 
 router = APIRouter()
 
@@ -14,12 +16,8 @@ async def root() -> Dict:
     }
 
 @router.get("/health")
-async def health_check() -> Dict:
+async def health_check(predictor: NutrientPredictor = Depends(get_predictor)) -> Dict:
     """Health check endpoint"""
-    # Import here to avoid circular imports
-    from ..core.dependencies import get_predictor
-    
-    predictor = get_predictor()
     return {
         "status": "healthy",
         "models_loaded": predictor.models_loaded,
@@ -1,15 +1,53 @@
 from fastapi import APIRouter, HTTPException, Depends
-from typing import Dict
-from ..schemas import UserProfile, PredictionResponse
+import numpy as np
+from typing import Dict, List, Tuple
+from ..schemas import UserProfile, PredictionResponse, NutrientPrediction, FeatureContribution
 from ..models import NutrientPredictor, RecommendationEngine
-from ..core.dependencies import get_predictor
+from ..core.dependencies import get_predictor, get_batcher, get_response_cache
+from ..core.batching import PredictionBatcher
+from ..core.cache import ResponseCache
 
 router = APIRouter()
 
+def _profile_key(profile: UserProfile, weight: float, height: float) -> Tuple:
+    """Hashable prediction cache key for a profile with its rounded weight and height"""
+    return (
+        profile.age,
+        profile.gender,
+        profile.race,
+        weight,
+        height,
+        profile.education,
+        profile.marital_status,
+        profile.country_of_birth
+    )
+
+def _build_response(
+    profile: UserProfile,
+    predictions: List[NutrientPrediction],
+    top_features: List[FeatureContribution],
+    probas: np.ndarray
+) -> PredictionResponse:
+    """Combine model output with recommendations and the overall health score"""
+    # Generate recommendations
+    recommendations = RecommendationEngine.generate_recommendations(predictions, profile)
+    
+    # Calculate overall health score
+    overall_health_score = float(max(0.0, 1.0 - probas.mean()))
+    
+    return PredictionResponse(
+        predictions=predictions,
+        top_features=top_features,
+        recommendations=recommendations,
+        overall_health_score=overall_health_score
+    )
+
 @router.post("/predict", response_model=PredictionResponse)
 async def predict_deficiencies(
     profile: UserProfile,
-    predictor: NutrientPredictor = Depends(get_predictor)
+    predictor: NutrientPredictor = Depends(get_predictor),
+    batcher: PredictionBatcher = Depends(get_batcher),
+    cache: ResponseCache = Depends(get_response_cache)
 ) -> PredictionResponse:
     """
     Predict nutrient deficiencies and provide personalized recommendations
@@ -27,22 +65,21 @@ async def predict_deficiencies(
         )
     
     try:
-        # Make predictions
-        predictions, top_features = predictor.predict(profile)
+        # Discretize weight and height so nearby profiles share a cache entry
+        weight = round(profile.weight, 1)
+        height = round(profile.height, 1)
+        cache_key = (predictor.model_version, _profile_key(profile, weight, height))
+        response = cache.get(cache_key)
         
-        # Generate recommendations
-        recommendations = RecommendationEngine.generate_recommendations(predictions, profile)
+        if response is None:
+            # Predict from the discretized profile so a cache key always maps to one response;
+            # copied without re-validation since rounding can land on a range bound
+            rounded_profile = profile.model_copy(update={"weight": weight, "height": height})
+            predictions, top_features, probas = await batcher.submit(rounded_profile)
+            response = _build_response(rounded_profile, predictions, top_features, probas)
+            cache.put(cache_key, response)
         
-        # Calculate overall health score
-        risk_scores = [p.risk_score for p in predictions]
-        overall_health_score = max(0, 1 - (sum(risk_scores) / len(risk_scores)))
-        
-        return PredictionResponse(
-            predictions=predictions,
-            top_features=top_features,
-            recommendations=recommendations,
-            overall_health_score=float(overall_health_score)
-        )
+        return response
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction error: {str(e)}")
@@ -1,3 +1,8 @@
-from .dependencies import get_predictor
+from .dependencies import get_predictor, get_batcher, get_response_cache
+from .batching import PredictionBatcher
+from .cache import ResponseCache
 
-__all__ = ["get_predictor"]
\ No newline at end of file
+__all__ = [
+    "get_predictor", "get_batcher", "get_response_cache",
+    "PredictionBatcher", "ResponseCache"
+]
\ No newline at end of file
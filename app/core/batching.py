@@ -0,0 +1,119 @@
+import asyncio
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Set, Tuple
+from ..models import NutrientPredictor
+from ..schemas import UserProfile, NutrientPrediction, FeatureContribution
+
+# Threads running model inference; XGBoost and SHAP release the GIL in native code
+PREDICT_WORKERS = os.cpu_count() or 1
+PREDICT_POOL = ThreadPoolExecutor(max_workers=PREDICT_WORKERS)
+
+class PredictionBatcher:
+    """
+    Collect concurrent prediction requests and run them as one batched inference.
+
+    Requests arriving within max_wait_ms of the first queued request (up to
+    max_batch of them) share a single predict_proba and SHAP call per nutrient.
+    Batches run on PREDICT_POOL so the event loop stays free; while every pool
+    thread is busy, new requests keep accumulating into the next batch.
+    """
+
+    def __init__(self, predictor: NutrientPredictor, max_batch: int = 32, max_wait_ms: float = 10):
+        self.predictor = predictor
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._running: Set[asyncio.Task] = set()
+
+    def start(self) -> None:
+        """Start the background batching task on the running event loop"""
+        self._queue = asyncio.Queue()
+        self._slots = asyncio.Semaphore(PREDICT_WORKERS)
+        self._worker = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """Cancel the background batching task, batches in flight and queued requests"""
+        tasks = list(self._running)
+        if self._worker is not None:
+            tasks.append(self._worker)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+        while self._queue is not None and not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+
+        self._queue = None
+        self._worker = None
+        self._slots = None
+        self._running.clear()
+
+    async def submit(
+        self, profile: UserProfile
+    ) -> Tuple[List[NutrientPrediction], List[FeatureContribution], np.ndarray]:
+        """Queue a profile for the next batch and wait for its predictions"""
+        if self._worker is None or self._worker.done():
+            raise RuntimeError("Prediction batcher is not running")
+
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((profile, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[UserProfile, asyncio.Future]]:
+        """Wait for a request, then gather more until the batch is full or the window closes"""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch:
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        """Dispatch batches to the prediction pool, at most one per pool thread"""
+        slots = self._slots
+        while True:
+            await slots.acquire()
+            batch = await self._collect()
+
+            task = asyncio.get_running_loop().create_task(self._predict(batch, slots))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _predict(
+        self, batch: List[Tuple[UserProfile, asyncio.Future]], slots: asyncio.Semaphore
+    ) -> None:
+        """Run one batched prediction, free its pool slot and hand each result back"""
+        profiles = [profile for profile, _ in batch]
+
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                PREDICT_POOL, self.predictor.predict_batch, profiles
+            )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        finally:
+            slots.release()
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
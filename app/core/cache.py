@@ -0,0 +1,28 @@
+from collections import OrderedDict
+from typing import Optional, Tuple
+from ..schemas import PredictionResponse
+
+class ResponseCache:
+    """
+    LRU cache of prediction responses keyed on (model version, profile key).
+
+    One cache is created per application alongside its predictor, so responses
+    are never shared between predictors that happen to be at the same version.
+    """
+
+    def __init__(self, max_size: int = 4096):
+        self.max_size = max_size
+        self._responses: "OrderedDict[Tuple, PredictionResponse]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[PredictionResponse]:
+        """Return a cached response and mark it most recently used, or None"""
+        response = self._responses.get(key)
+        if response is not None:
+            self._responses.move_to_end(key)
+        return response
+
+    def put(self, key: Tuple, response: PredictionResponse) -> None:
+        """Store a response, evicting the least recently used one when full"""
+        self._responses[key] = response
+        if len(self._responses) > self.max_size:
+            self._responses.popitem(last=False)
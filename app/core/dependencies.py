@@ -1,18 +1,16 @@
-from functools import lru_cache
-from pathlib import Path
+from fastapi import Request
 from ..models import NutrientPredictor
+from .batching import PredictionBatcher
+from .cache import ResponseCache
 
-# Global predictor instance
-_predictor_instance = None
+def get_predictor(request: Request) -> NutrientPredictor:
+    """Get the predictor loaded at application startup"""
+    return request.app.state.predictor
 
-@lru_cache()
-def get_predictor() -> NutrientPredictor:
-    """Get or create the predictor instance (singleton pattern)"""
-    global _predictor_instance
-    
-    if _predictor_instance is None:
-        model_dir = Path(__file__).parent.parent.parent / "saved_models"
-        _predictor_instance = NutrientPredictor(model_dir)
-        _predictor_instance.load_models()
-    
-    return _predictor_instance
\ No newline at end of file
+def get_batcher(request: Request) -> PredictionBatcher:
+    """Get the prediction batcher shared by all requests"""
+    return request.app.state.batcher
+
+def get_response_cache(request: Request) -> ResponseCache:
+    """Get the response cache belonging to the loaded predictor"""
+    return request.app.state.response_cache
\ No newline at end of file
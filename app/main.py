@@ -1,8 +1,26 @@
+from contextlib import asynccontextmanager
+from pathlib import Path
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
 from .api import api_router
+from .core.batching import PredictionBatcher
+from .core.cache import ResponseCache
+from .models import NutrientPredictor
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Load models before serving requests and run the prediction batcher"""
+    predictor = NutrientPredictor(Path(__file__).parent.parent / "saved_models")
+    predictor.load_models()
+    
+    app.state.predictor = predictor
+    app.state.response_cache = ResponseCache()
+    app.state.batcher = PredictionBatcher(predictor)
+    app.state.batcher.start()
+    yield
+    await app.state.batcher.stop()
 
 # Create FastAPI application
 app = FastAPI(
@@ -10,7 +28,8 @@ app = FastAPI(
     description="AI-powered personalized nutrition recommendations using NHANES data",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    lifespan=lifespan
 )
 
 # CORS configuration for React frontend
@@ -1,4 +1,5 @@
 from .predictor import NutrientPredictor
 from .recommendations import RecommendationEngine
+from .calibration import FastCalibratedClassifier
 
-__all__ = ["NutrientPredictor", "RecommendationEngine"]
\ No newline at end of file
+__all__ = ["NutrientPredictor", "RecommendationEngine", "FastCalibratedClassifier"]
\ No newline at end of file
@@ -1,22 +1,110 @@
 import joblib
 import numpy as np
-import pandas as pd
 import shap
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from numba import njit, types
 from pathlib import Path
+from types import MappingProxyType
+from xgboost import XGBModel
 from typing import Dict, List, Tuple, Optional
 from ..schemas import UserProfile, NutrientPrediction, FeatureContribution
+from .calibration import FastCalibratedClassifier
+
+# Compiled eagerly for the exact argument types create_feature_vector passes
+@njit(
+    types.void(types.float64[::1], types.int64[::1], *(types.float64,) * 8),
+    cache=True
+)
+def _fill_vector(out, idx, age, gender_code, race_code, weight, height, born_code, educ_code, marital_code):
+    """Write profile-driven features into a template copy at the positions in idx"""
+    out[idx[0]] = age
+    out[idx[1]] = gender_code
+    out[idx[2]] = race_code
+    out[idx[3]] = weight
+    out[idx[4]] = height
+    out[idx[5]] = weight / ((height / 100) ** 2)
+    out[idx[6]] = born_code
+    out[idx[7]] = educ_code
+    out[idx[8]] = marital_code
+    out[idx[9]] = race_code  # RIDRETH1 mirrors RIDRETH3
+
+def _mean_shap_kernel(shap_values, out):
+    """Average per-nutrient SHAP matrices elementwise into out"""
+    n_nutrients = len(shap_values)
+    n_profiles, n_features = out.shape
+    for i in range(n_profiles):
+        for j in range(n_features):
+            total = shap_values[0][i, j]
+            for k in range(1, n_nutrients):
+                total += shap_values[k][i, j]
+            out[i, j] = total / np.float32(n_nutrients)
 
 class NutrientPredictor:
     """Main predictor service for nutrient deficiency prediction"""
     
+    # NHANES codes for user profile categories
+    _RACE_MAP = MappingProxyType({
+        "Mexican American": 1,
+        "Other Hispanic": 2, 
+        "Non-Hispanic White": 3,
+        "Non-Hispanic Black": 4,
+        "Other Race": 6
+    })
+    _EDUC_MAP = MappingProxyType({
+        "Less than 9th grade": 1,
+        "9-11th grade": 2,
+        "High school graduate": 3,
+        "Some college": 4,
+        "College graduate or above": 5
+    })
+    _MARITAL_MAP = MappingProxyType({
+        "Married": 1,
+        "Widowed": 2,
+        "Divorced": 3,
+        "Separated": 4,
+        "Never married": 5,
+        "Living with partner": 6
+    })
+    
+    # Human-readable descriptions of NHANES feature codes
+    _FEATURE_DESCRIPTIONS = MappingProxyType({
+        'RIDAGEYR': 'Age (years)',
+        'RIAGENDR': 'Gender',
+        'RIDRETH3': 'Race/Ethnicity',
+        'BMXWT': 'Weight (kg)',
+        'BMXHT': 'Height (cm)',
+        'BMXBMI': 'Body Mass Index',
+        'SDDSRVYR': 'Survey Year',
+        'RIDSTATR': 'Interview/Examination Status',
+        'RIDRETH1': 'Race/Ethnicity (Detailed)',
+        'RIDEXMON': 'Examination Month',
+        'DMQMILIZ': 'Military Service',
+        'DMDBORN4': 'Country of Birth',
+        'DMDCITZN': 'Citizenship Status',
+        'DMDEDUC2': 'Education Level',
+        'DMDMARTL': 'Marital Status',
+        'SIALANG': 'Interview Language',
+        'SIAPROXY': 'Proxy Used in Interview',
+        'SIAINTRP': 'Interpreter Used',
+        'FIALANG': 'Family Interview Language',
+        'FIAPROXY': 'Family Proxy Used'
+    })
+    
     def __init__(self, model_dir: Path):
         self.model_dir = model_dir
         self.models_loaded = False
+        self.model_version = 0
         self.models = {}
         self.calibrated_models = {}
+        self._probability_steps = []
         self.explainers = {}
         self.scalers = {}
         self.feature_names = []
+        self._feature_desc_list = []
+        self.nutrients = []
+        self._scale_buffers = threading.local()
         
         # Clinical thresholds for reference (evidence-based)
         self.clinical_thresholds = {
@@ -31,6 +119,19 @@ class NutrientPredictor:
         try:
             nutrients = ['b12_deficient', 'iron_deficient', 'diabetes_risk']
             
+            # Read and unpickle all artifacts concurrently; joblib releases the GIL
+            # during file I/O and decompression. Errors surface on .result() below.
+            artifact_names = [
+                f"{nutrient}_{kind}.pkl"
+                for nutrient in nutrients
+                for kind in ('model', 'calibrated_model', 'scaler')
+            ] + ["feature_names.pkl"]
+            with ThreadPoolExecutor() as pool:
+                artifacts = {
+                    name: pool.submit(joblib.load, self.model_dir / name)
+                    for name in artifact_names
+                }
+            
             # Load base models
             self.models = {}
             self.calibrated_models = {}
@@ -38,39 +139,91 @@ class NutrientPredictor:
             
             for nutrient in nutrients:
                 # Load base model for interpretability
-                self.models[nutrient] = joblib.load(self.model_dir / f"{nutrient}_model.pkl")
+                self.models[nutrient] = artifacts[f"{nutrient}_model.pkl"].result()
                 
                 # Load calibrated model for reliable probabilities
                 try:
-                    self.calibrated_models[nutrient] = joblib.load(
-                        self.model_dir / f"{nutrient}_calibrated_model.pkl"
-                    )
+                    self.calibrated_models[nutrient] = artifacts[f"{nutrient}_calibrated_model.pkl"].result()
                 except FileNotFoundError:
                     print(f"Warning: Calibrated model not found for {nutrient}, using base model")
                     self.calibrated_models[nutrient] = self.models[nutrient]
                 
                 # Load individual scalers
                 try:
-                    self.scalers[nutrient] = joblib.load(self.model_dir / f"{nutrient}_scaler.pkl")
+                    self.scalers[nutrient] = artifacts[f"{nutrient}_scaler.pkl"].result()
                 except FileNotFoundError:
                     print(f"Warning: Individual scaler not found for {nutrient}")
             
+            # Per-nutrient probability steps run by _infer_all. Calibrated models are
+            # scored through their native boosters where supported, which yields the
+            # calibrated and uncalibrated probabilities from one pass over the folds;
+            # other models go through sklearn but report the same two quantities.
+            self._probability_steps = []
+            for nutrient in nutrients:
+                fast_model = FastCalibratedClassifier.from_model(self.calibrated_models[nutrient])
+                if fast_model is not None:
+                    self._probability_steps.append(fast_model.predict_positive_with_raw)
+                else:
+                    self._probability_steps.append(partial(
+                        self._predict_with_calibration_folds, self.calibrated_models[nutrient]
+                    ))
+            
+            # PREDICT_POOL already runs one batch per core, so each booster predicts and
+            # computes SHAP contributions on a single thread rather than on every core
+            for nutrient in nutrients:
+                estimators = [self.models[nutrient]] + [
+                    calibrated.estimator
+                    for calibrated in getattr(self.calibrated_models[nutrient], "calibrated_classifiers_", [])
+                ]
+                for estimator in estimators:
+                    if isinstance(estimator, XGBModel):
+                        estimator.get_booster().set_param({"nthread": 1})
+            
             # Fallback to shared scaler and feature names if individual ones don't exist
             if not self.scalers:
                 self.scaler = joblib.load(self.model_dir / "scaler.pkl")
                 for nutrient in nutrients:
                     self.scalers[nutrient] = self.scaler
                     
-            self.feature_names = joblib.load(self.model_dir / "feature_names.pkl")
+            self.feature_names = artifacts["feature_names.pkl"].result()
+            self._build_feature_template()
+            self._feature_desc_list = [self._get_feature_description(feat) for feat in self.feature_names]
+            
+            # Stack scaler statistics as (n_nutrients, 1, n_features) so all
+            # nutrients are standardized in one broadcast operation
+            self.nutrients = nutrients
+            self._scaler_means = np.stack([
+                self.scalers[nutrient].mean_ if self.scalers[nutrient].with_mean
+                else np.zeros(len(self.feature_names))
+                for nutrient in nutrients
+            ])[:, np.newaxis, :]
+            self._scaler_scales = np.stack([
+                self.scalers[nutrient].scale_ if self.scalers[nutrient].with_std
+                else np.ones(len(self.feature_names))
+                for nutrient in nutrients
+            ])[:, np.newaxis, :]
+            
+            # Specialize SHAP averaging for this nutrient count and XGBoost's float32 output
+            self._mean_shap = njit(
+                types.void(
+                    types.UniTuple(types.float32[:, :], len(nutrients)),
+                    types.float32[:, ::1]
+                ),
+                cache=True
+            )(_mean_shap_kernel)
             
-            # Create SHAP explainers
+            # Create SHAP explainers; tree_path_dependent needs no background data
             self.explainers = {
-                'b12_deficient': shap.TreeExplainer(self.models['b12_deficient']),
-                'iron_deficient': shap.TreeExplainer(self.models['iron_deficient']),
-                'diabetes_risk': shap.TreeExplainer(self.models['diabetes_risk'])
+                nutrient: shap.TreeExplainer(
+                    self.models[nutrient],
+                    feature_perturbation="tree_path_dependent",
+                    model_output="raw"
+                )
+                for nutrient in nutrients
             }
             
             self.models_loaded = True
+            self.model_version += 1
             print(f"Models loaded successfully! Features: {len(self.feature_names)}")
             return True
             
@@ -79,103 +232,147 @@ class NutrientPredictor:
             self.models_loaded = False
             return False
     
-    def create_feature_vector(self, profile: UserProfile) -> pd.DataFrame:
-        """Convert user profile to NHANES feature vector"""
-        feature_dict = {}
+    def _build_feature_template(self) -> None:
+        """Precompute constant feature defaults and positions of profile-driven features"""
+        n_features = len(self.feature_names)
+        feature_index = {feat: i for i, feat in enumerate(self.feature_names)}
         
-        for feat in self.feature_names:
-            if feat == 'RIDAGEYR':
-                feature_dict[feat] = profile.age
-            elif feat == 'RIAGENDR':
-                feature_dict[feat] = 1 if profile.gender == "Male" else 2
-            elif feat == 'RIDRETH3':
-                race_mapping = {
-                    "Mexican American": 1,
-                    "Other Hispanic": 2, 
-                    "Non-Hispanic White": 3,
-                    "Non-Hispanic Black": 4,
-                    "Other Race": 6
-                }
-                feature_dict[feat] = race_mapping.get(profile.race, 6)
-            elif feat == 'BMXWT':
-                feature_dict[feat] = profile.weight
-            elif feat == 'BMXHT':
-                feature_dict[feat] = profile.height
-            elif feat == 'BMXBMI':
-                height_m = profile.height / 100
-                feature_dict[feat] = profile.weight / (height_m ** 2)
-            elif feat == 'DMDBORN4':
-                feature_dict[feat] = 1 if profile.country_of_birth == "US" else 2
-            elif feat == 'DMDEDUC2':
-                education_mapping = {
-                    "Less than 9th grade": 1,
-                    "9-11th grade": 2,
-                    "High school graduate": 3,
-                    "Some college": 4,
-                    "College graduate or above": 5
-                }
-                feature_dict[feat] = education_mapping.get(profile.education, 3)
-            elif feat == 'DMDMARTL':
-                marital_mapping = {
-                    "Married": 1,
-                    "Widowed": 2,
-                    "Divorced": 3,
-                    "Separated": 4,
-                    "Never married": 5,
-                    "Living with partner": 6
-                }
-                feature_dict[feat] = marital_mapping.get(profile.marital_status, 5)
-            elif feat == 'SDDSRVYR':
-                feature_dict[feat] = 8  # 2013-2014 survey
-            elif feat == 'RIDSTATR':
-                feature_dict[feat] = 2  # Both interviewed and examined
-            elif feat == 'RIDRETH1':
-                feature_dict[feat] = feature_dict.get('RIDRETH3', 3)
-            elif feat == 'RIDEXMON':
-                feature_dict[feat] = 6  # Default examination month
-            elif feat in ['DMQMILIZ', 'DMDCITZN']:
-                feature_dict[feat] = 1  # Default values
-            elif feat in ['SIALANG', 'FIALANG']:
-                feature_dict[feat] = 1  # English
-            elif feat in ['SIAPROXY', 'SIAINTRP', 'FIAPROXY']:
-                feature_dict[feat] = 2  # No proxy/interpreter
-            else:
-                feature_dict[feat] = 0.0  # Default
+        # Features the model does not use are written to a trailing scratch slot
+        def position(feat: str) -> int:
+            return feature_index.get(feat, n_features)
+        
+        defaults = {
+            'SDDSRVYR': 8,  # 2013-2014 survey
+            'RIDSTATR': 2,  # Both interviewed and examined
+            'RIDEXMON': 6,  # Default examination month
+            'DMQMILIZ': 1,  # Default values
+            'DMDCITZN': 1,
+            'SIALANG': 1,  # English
+            'FIALANG': 1,
+            'SIAPROXY': 2,  # No proxy/interpreter
+            'SIAINTRP': 2,
+            'FIAPROXY': 2,
+        }
+        self._default_vector = np.zeros(n_features + 1)
+        for feat, value in defaults.items():
+            self._default_vector[position(feat)] = value
         
-        df = pd.DataFrame([feature_dict])
-        return df[self.feature_names]
+        # Positions in _fill_vector argument order
+        self._profile_idx = np.array([
+            position(feat) for feat in (
+                'RIDAGEYR', 'RIAGENDR', 'RIDRETH3', 'BMXWT', 'BMXHT',
+                'BMXBMI', 'DMDBORN4', 'DMDEDUC2', 'DMDMARTL', 'RIDRETH1'
+            )
+        ], dtype=np.int64)
     
-    def predict(self, profile: UserProfile) -> Tuple[List[NutrientPrediction], List[FeatureContribution]]:
-        """Make predictions and return results with interpretability"""
+    def create_feature_vector(self, profile: UserProfile) -> np.ndarray:
+        """Convert user profile to NHANES feature vector of shape (1, n_features)"""
+        vector = self._default_vector.copy()
+        _fill_vector(
+            vector,
+            self._profile_idx,
+            float(profile.age),
+            1.0 if profile.gender == "Male" else 2.0,
+            float(self._RACE_MAP.get(profile.race, 6)),
+            float(profile.weight),
+            float(profile.height),
+            1.0 if profile.country_of_birth == "US" else 2.0,
+            float(self._EDUC_MAP.get(profile.education, 3)),
+            float(self._MARITAL_MAP.get(profile.marital_status, 5))
+        )
+        
+        return vector[np.newaxis, :len(self.feature_names)]
+    
+    def predict(self, profile: UserProfile) -> Tuple[List[NutrientPrediction], List[FeatureContribution], np.ndarray]:
+        """Make predictions and return results with interpretability and raw probabilities"""
+        return self.predict_batch([profile])[0]
+    
+    def predict_batch(
+        self, profiles: List[UserProfile]
+    ) -> List[Tuple[List[NutrientPrediction], List[FeatureContribution], np.ndarray]]:
+        """Make predictions for several profiles with one model call per nutrient"""
         if not self.models_loaded:
             raise RuntimeError("Models not loaded")
         
-        # Create features
-        features = self.create_feature_vector(profile)
+        # Create features: (n_profiles, n_features)
+        features = np.concatenate([self.create_feature_vector(profile) for profile in profiles])
         
-        # Make predictions
-        predictions = []
+        # Standardize and score calibrated models for every nutrient
+        features_scaled, probas, base_probas = self._infer_all(features)
+        
+        # SHAP values using base model for interpretability
         all_shap_values = []
+        for nutrient_key, features_scaled_individual in zip(self.nutrients, features_scaled):
+            shap_values = self.explainers[nutrient_key].shap_values(
+                features_scaled_individual,
+                check_additivity=False
+            )
+            if isinstance(shap_values, list):
+                shap_values = shap_values[1]  # Positive class
+            all_shap_values.append(shap_values.astype(np.float32, copy=False))
+        
+        # Aggregate SHAP values across nutrients: (n_profiles, n_features)
+        avg_shap = np.empty(features.shape, dtype=np.float32)
+        self._mean_shap(tuple(all_shap_values), avg_shap)
+        
+        return [
+            (
+                self._build_predictions(probas[i], base_probas[i]),
+                self._top_features(features[i], avg_shap[i]),
+                probas[i]
+            )
+            for i in range(len(profiles))
+        ]
+    
+    def _infer_all(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Standardize features and score every nutrient's calibrated model.
+        
+        Returns the scaled features, shape (n_nutrients, n_profiles, n_features), and the
+        calibrated and uncalibrated probabilities, each shape (n_profiles, n_nutrients).
+        """
+        features_scaled = self._scale_features(features)
         
+        probas = np.empty((len(features), len(self.nutrients)))
+        base_probas = np.empty_like(probas)
+        for i, (predict_step, features_scaled_individual) in enumerate(
+            zip(self._probability_steps, features_scaled)
+        ):
+            probas[:, i], base_probas[:, i] = predict_step(features_scaled_individual)
+        
+        return features_scaled, probas, base_probas
+    
+    @staticmethod
+    def _predict_with_calibration_folds(calibrated_model, features_scaled: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calibrated probabilities and the calibration folds' mean uncalibrated probabilities
+        for models without a native fast path, matching FastCalibratedClassifier.
+        
+        A model without calibration folds is its own uncalibrated estimator.
+        """
+        estimators = [
+            calibrated.estimator
+            for calibrated in getattr(calibrated_model, "calibrated_classifiers_", [])
+        ] or [calibrated_model]
+        
+        mean_raw = np.zeros(len(features_scaled))
+        for estimator in estimators:
+            mean_raw += estimator.predict_proba(features_scaled)[:, 1]
+        mean_raw /= len(estimators)
+        
+        return calibrated_model.predict_proba(features_scaled)[:, 1], mean_raw
+    
+    def _build_predictions(self, probas: np.ndarray, base_probas: np.ndarray) -> List[NutrientPrediction]:
+        """Turn per-nutrient probabilities for one profile into clinical predictions"""
         nutrient_mapping = {
             'b12_deficient': 'Vitamin B12',
             'iron_deficient': 'Iron',
             'diabetes_risk': 'Diabetes Risk'
         }
         
-        for nutrient_key, nutrient_name in nutrient_mapping.items():
-            model = self.models[nutrient_key]
-            explainer = self.explainers[nutrient_key]
-            
-            # Get calibrated probability for reliable estimates
-            calibrated_model = self.calibrated_models[nutrient_key]
-            scaler = self.scalers[nutrient_key]  # Use individual scaler
-            
-            # Scale features using nutrient-specific scaler
-            features_scaled_individual = scaler.transform(features)
-                
-            # Get calibrated probability
-            proba = calibrated_model.predict_proba(features_scaled_individual)[0, 1]
+        predictions = []
+        for nutrient_key, proba, base_proba in zip(self.nutrients, probas, base_probas):
+            nutrient_name = nutrient_mapping[nutrient_key]
             
             # Categorize risk with clinical context
             if proba < 0.15:
@@ -186,8 +383,8 @@ class NutrientPredictor:
                 risk_category = 'High'
             
             # Calculate confidence interval instead of misleading "100%" confidence
-            # Use prediction uncertainty from ensemble or bootstrap if available
-            base_proba = model.predict_proba(features_scaled_individual)[0, 1]
+            # Uncertainty is the gap between the calibrated probability and the
+            # calibration folds' mean uncalibrated probability
             uncertainty = abs(proba - base_proba) + 0.05  # Minimum uncertainty
             
             # Confidence interval bounds
@@ -214,56 +411,53 @@ class NutrientPredictor:
                 confidence_upper=float(conf_upper),
                 note=note
             ))
-            
-            # SHAP values using base model for interpretability
-            shap_values = explainer.shap_values(features_scaled_individual)
-            if isinstance(shap_values, list):
-                shap_values = shap_values[1]  # Positive class
-            all_shap_values.append(shap_values[0])
         
-        # Aggregate SHAP values
-        avg_shap = np.mean(all_shap_values, axis=0)
+        return predictions
+    
+    def _top_features(self, features: np.ndarray, shap_values: np.ndarray) -> List[FeatureContribution]:
+        """Select the 5 features with largest absolute impact, ordered by impact"""
+        abs_impact = np.abs(shap_values)
+        # Ties go to the lowest feature index, as with a stable sort
+        top_idx = np.lexsort((np.arange(len(abs_impact)), -abs_impact))[:5]
         
-        # Top features
-        top_features = []
-        for i, feat_name in enumerate(self.feature_names):
-            top_features.append(FeatureContribution(
-                feature=feat_name,
-                feature_name=self._get_feature_description(feat_name),
-                value=float(features.iloc[0, i]),
-                impact=float(avg_shap[i])
-            ))
+        # Gather the selected features column-wise before building any objects
+        top_names = [self.feature_names[i] for i in top_idx]
+        top_descriptions = [self._feature_desc_list[i] for i in top_idx]
+        top_values = features[top_idx].tolist()
+        top_impacts = shap_values[top_idx].tolist()
         
-        # Sort by absolute impact
-        top_features.sort(key=lambda x: abs(x.impact), reverse=True)
+        # Fields come from trusted model output, so skip pydantic validation
+        return [
+            FeatureContribution.model_construct(
+                feature=name,
+                feature_name=description,
+                value=value,
+                impact=impact
+            )
+            for name, description, value, impact in zip(top_names, top_descriptions, top_values, top_impacts)
+        ]
+    
+    def _scale_features(self, features: np.ndarray) -> np.ndarray:
+        """Standardize features for all nutrients into reusable per-thread buffers"""
+        n_nutrients = len(self.nutrients)
+        n_profiles, n_features = features.shape
+        buffers = self._scale_buffers
+        scaled = getattr(buffers, 'scaled', None)
+        if scaled is None or scaled.shape[0] != n_nutrients or scaled.shape[1] < n_profiles or scaled.shape[2] != n_features:
+            buffers.work = np.empty((n_nutrients, n_profiles, n_features))
+            buffers.scaled = np.empty((n_nutrients, n_profiles, n_features), dtype=np.float32)
         
-        return predictions, top_features[:5]
+        # Standardize in float64 like StandardScaler, then round once into the
+        # C-contiguous float32 layout XGBoost and TreeSHAP consume without copying
+        work = buffers.work[:, :n_profiles]
+        scaled = buffers.scaled[:, :n_profiles]
+        np.subtract(features, self._scaler_means, out=work)
+        np.divide(work, self._scaler_scales, out=scaled)
+        return scaled
     
     def _get_feature_description(self, feature_code: str) -> str:
         """Convert NHANES feature codes to human-readable descriptions"""
-        descriptions = {
-            'RIDAGEYR': 'Age (years)',
-            'RIAGENDR': 'Gender',
-            'RIDRETH3': 'Race/Ethnicity',
-            'BMXWT': 'Weight (kg)',
-            'BMXHT': 'Height (cm)',
-            'BMXBMI': 'Body Mass Index',
-            'SDDSRVYR': 'Survey Year',
-            'RIDSTATR': 'Interview/Examination Status',
-            'RIDRETH1': 'Race/Ethnicity (Detailed)',
-            'RIDEXMON': 'Examination Month',
-            'DMQMILIZ': 'Military Service',
-            'DMDBORN4': 'Country of Birth',
-            'DMDCITZN': 'Citizenship Status',
-            'DMDEDUC2': 'Education Level',
-            'DMDMARTL': 'Marital Status',
-            'SIALANG': 'Interview Language',
-            'SIAPROXY': 'Proxy Used in Interview',
-            'SIAINTRP': 'Interpreter Used',
-            'FIALANG': 'Family Interview Language',
-            'FIAPROXY': 'Family Proxy Used'
-        }
-        return descriptions.get(feature_code, feature_code)
+        return self._FEATURE_DESCRIPTIONS.get(feature_code, feature_code)
     
     def get_feature_info(self) -> Dict:
         """Get information about model features"""
@@ -271,8 +465,8 @@ class NutrientPredictor:
             "features": [
                 {
                     "code": feat,
-                    "description": self._get_feature_description(feat)
-                } for feat in self.feature_names
+                    "description": description
+                } for feat, description in zip(self.feature_names, self._feature_desc_list)
             ],
             "total_features": len(self.feature_names)
         }
\ No newline at end of file
@@ -1,5 +1,117 @@
 from typing import List
-from ..schemas import UserProfile, NutrientPrediction, Recommendation
+from ..schemas import UserProfile, NutrientPrediction, Recommendation, Priority
+
+# ------------------------------
+#  Recommendation templates
+# ------------------------------
+# Validated once at import; per-request variants are made with model_copy,
+# which fills in priority and rationale without re-running validation.
+_B12_TESTING = Recommendation(
+    category='Medical',
+    priority='High',
+    recommendation=(
+        "Discuss B12 testing and possible supplementation with a healthcare professional. "
+        "High-dose B12 supplements (commonly 1000 μg) are available over-the-counter, "
+        "but dosage should be clinically guided."
+    ),
+    rationale=''
+)
+
+_B12_DIET = Recommendation(
+    category='Dietary',
+    priority='High',
+    recommendation=(
+        "Increase B12-rich foods such as fortified cereals, dairy products, eggs, fish, "
+        "and lean meats."
+    ),
+    rationale="Vitamin B12 is primarily obtained from animal products and fortified foods."
+)
+
+_IRON_DIET = Recommendation(
+    category='Dietary',
+    priority='High',
+    recommendation=(
+        "Increase intake of iron-rich foods such as lean red meat, poultry, fish, "
+        "legumes, dark leafy greens, and fortified cereals."
+    ),
+    rationale=''
+)
+
+_IRON_SUPPLEMENT = Recommendation(
+    category='Medical',
+    priority='High',
+    recommendation=(
+        "Consider discussing iron supplementation with a healthcare provider. "
+        "Women often have higher iron requirements, but supplementation should "
+        "only be started after clinical evaluation."
+    ),
+    rationale="Additional iron needs may occur due to menstrual blood loss."
+)
+
+_IRON_ABSORPTION = Recommendation(
+    category='Dietary',
+    priority='Medium',
+    recommendation=(
+        "Enhance iron absorption by consuming vitamin C-rich foods (e.g., citrus fruits) "
+        "together with iron-rich meals."
+    ),
+    rationale="Vitamin C improves non-heme iron absorption."
+)
+
+_VITD_SUNLIGHT = Recommendation(
+    category='Lifestyle',
+    priority='High',
+    recommendation=(
+        "Get regular safe sunlight exposure when possible (10–30 minutes depending on skin type). "
+        "Discuss vitamin D supplementation with a healthcare provider if sunlight exposure is limited."
+    ),
+    rationale=''
+)
+
+_VITD_DIET = Recommendation(
+    category='Dietary',
+    priority='High',
+    recommendation=(
+        "Include vitamin D-rich foods such as fatty fish (e.g., salmon, mackerel), "
+        "fortified dairy or plant milks, and egg yolks."
+    ),
+    rationale="Few foods naturally contain vitamin D."
+)
+
+_WEIGHT_GAIN = Recommendation(
+    category='Lifestyle',
+    priority='Medium',
+    recommendation=(
+        "Consider speaking with a registered dietitian to develop a healthy weight-gain plan."
+    ),
+    rationale=''
+)
+
+_WEIGHT_MANAGEMENT = Recommendation(
+    category='Lifestyle',
+    priority='Medium',
+    recommendation=(
+        "Engage in regular physical activity and follow a balanced diet to support healthy "
+        "weight management."
+    ),
+    rationale=''
+)
+
+_OLDER_ADULT_SCREENING = Recommendation(
+    category='Medical',
+    priority='Medium',
+    recommendation=(
+        "Older adults may benefit from routine screening for vitamin D, B12, and iron status."
+    ),
+    rationale="Nutrient absorption and dietary intake often change with age."
+)
+
+_BALANCED_DIET = Recommendation(
+    category='Lifestyle',
+    priority='Low',
+    recommendation="Maintain a balanced diet with a variety of food groups.",
+    rationale="Dietary diversity supports adequate nutrient intake."
+)
 
 class RecommendationEngine:
     """
@@ -36,28 +148,15 @@ class RecommendationEngine:
     @staticmethod
     def _get_b12_recommendations(pred: NutrientPrediction, priority: str) -> List[Recommendation]:
         recs = []
+        priority = Priority(priority)
 
         if pred.risk_category == 'High':
-            recs.append(Recommendation(
-                category='Medical',
-                priority=priority,
-                recommendation=(
-                    "Discuss B12 testing and possible supplementation with a healthcare professional. "
-                    "High-dose B12 supplements (commonly 1000 μg) are available over-the-counter, "
-                    "but dosage should be clinically guided."
-                ),
-                rationale=f'High predicted risk of B12 deficiency (risk score: {pred.risk_score:.2f})'
-            ))
-
-        recs.append(Recommendation(
-            category='Dietary',
-            priority=priority,
-            recommendation=(
-                "Increase B12-rich foods such as fortified cereals, dairy products, eggs, fish, "
-                "and lean meats."
-            ),
-            rationale="Vitamin B12 is primarily obtained from animal products and fortified foods."
-        ))
+            recs.append(_B12_TESTING.model_copy(update={
+                'priority': priority,
+                'rationale': f'High predicted risk of B12 deficiency (risk score: {pred.risk_score:.2f})'
+            }))
+
+        recs.append(_B12_DIET.model_copy(update={'priority': priority}))
 
         return recs
 
@@ -67,40 +166,19 @@ class RecommendationEngine:
     @staticmethod
     def _get_iron_recommendations(pred: NutrientPrediction, profile: UserProfile, priority: str) -> List[Recommendation]:
         recs = []
+        priority = Priority(priority)
 
-        recs.append(Recommendation(
-            category='Dietary',
-            priority=priority,
-            recommendation=(
-                "Increase intake of iron-rich foods such as lean red meat, poultry, fish, "
-                "legumes, dark leafy greens, and fortified cereals."
-            ),
-            rationale=f'{pred.risk_category} predicted risk of anemia/iron deficiency (risk score: {pred.risk_score:.2f}).'
-        ))
+        recs.append(_IRON_DIET.model_copy(update={
+            'priority': priority,
+            'rationale': f'{pred.risk_category} predicted risk of anemia/iron deficiency (risk score: {pred.risk_score:.2f}).'
+        }))
 
         # SAFETY IMPROVEMENT — No automatic dosage recommendation
         # Supplementation requires medical assessment.
         if profile.gender == "Female":
-            recs.append(Recommendation(
-                category='Medical',
-                priority=priority,
-                recommendation=(
-                    "Consider discussing iron supplementation with a healthcare provider. "
-                    "Women often have higher iron requirements, but supplementation should "
-                    "only be started after clinical evaluation."
-                ),
-                rationale="Additional iron needs may occur due to menstrual blood loss."
-            ))
-
-        recs.append(Recommendation(
-            category='Dietary',
-            priority='Medium',
-            recommendation=(
-                "Enhance iron absorption by consuming vitamin C-rich foods (e.g., citrus fruits) "
-                "together with iron-rich meals."
-            ),
-            rationale="Vitamin C improves non-heme iron absorption."
-        ))
+            recs.append(_IRON_SUPPLEMENT.model_copy(update={'priority': priority}))
+
+        recs.append(_IRON_ABSORPTION.model_copy())
 
         return recs
 
@@ -110,26 +188,14 @@ class RecommendationEngine:
     @staticmethod
     def _get_vitd_recommendations(pred: NutrientPrediction, priority: str) -> List[Recommendation]:
         recs = []
+        priority = Priority(priority)
 
-        recs.append(Recommendation(
-            category='Lifestyle',
-            priority=priority,
-            recommendation=(
-                "Get regular safe sunlight exposure when possible (10–30 minutes depending on skin type). "
-                "Discuss vitamin D supplementation with a healthcare provider if sunlight exposure is limited."
-            ),
-            rationale=f'{pred.risk_category} predicted risk of vitamin D deficiency (risk score: {pred.risk_score:.2f}).'
-        ))
-
-        recs.append(Recommendation(
-            category='Dietary',
-            priority=priority,
-            recommendation=(
-                "Include vitamin D-rich foods such as fatty fish (e.g., salmon, mackerel), "
-                "fortified dairy or plant milks, and egg yolks."
-            ),
-            rationale="Few foods naturally contain vitamin D."
-        ))
+        recs.append(_VITD_SUNLIGHT.model_copy(update={
+            'priority': priority,
+            'rationale': f'{pred.risk_category} predicted risk of vitamin D deficiency (risk score: {pred.risk_score:.2f}).'
+        }))
+
+        recs.append(_VITD_DIET.model_copy(update={'priority': priority}))
 
         return recs
 
@@ -143,41 +209,18 @@ class RecommendationEngine:
         bmi = profile.weight / ((profile.height / 100) ** 2)
 
         if bmi < 18.5:
-            recs.append(Recommendation(
-                category='Lifestyle',
-                priority='Medium',
-                recommendation=(
-                    "Consider speaking with a registered dietitian to develop a healthy weight-gain plan."
-                ),
-                rationale=f"BMI of {bmi:.1f} is below the healthy range."
-            ))
+            recs.append(_WEIGHT_GAIN.model_copy(update={
+                'rationale': f"BMI of {bmi:.1f} is below the healthy range."
+            }))
         
         elif bmi > 25:
-            recs.append(Recommendation(
-                category='Lifestyle',
-                priority='Medium',
-                recommendation=(
-                    "Engage in regular physical activity and follow a balanced diet to support healthy "
-                    "weight management."
-                ),
-                rationale=f"BMI of {bmi:.1f} is {'slightly ' if bmi < 30 else ''}above the healthy range."
-            ))
+            recs.append(_WEIGHT_MANAGEMENT.model_copy(update={
+                'rationale': f"BMI of {bmi:.1f} is {'slightly ' if bmi < 30 else ''}above the healthy range."
+            }))
 
         if profile.age > 65:
-            recs.append(Recommendation(
-                category='Medical',
-                priority='Medium',
-                recommendation=(
-                    "Older adults may benefit from routine screening for vitamin D, B12, and iron status."
-                ),
-                rationale="Nutrient absorption and dietary intake often change with age."
-            ))
-
-        recs.append(Recommendation(
-            category='Lifestyle',
-            priority='Low',
-            recommendation="Maintain a balanced diet with a variety of food groups.",
-            rationale="Dietary diversity supports adequate nutrient intake."
-        ))
+            recs.append(_OLDER_ADULT_SCREENING.model_copy())
+
+        recs.append(_BALANCED_DIET.model_copy())
 
         return recs
\ No newline at end of file
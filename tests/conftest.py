@@ -0,0 +1,9 @@
+import pytest
+from fastapi.testclient import TestClient
+from app.main import app
+
+@pytest.fixture(scope="module")
+def client():
+    # Entering the client runs the lifespan, which loads the models
+    with TestClient(app) as client:
+        yield client
@@ -0,0 +1,55 @@
+from concurrent.futures import ThreadPoolExecutor
+from app.schemas import UserProfile
+
+PROFILES = [
+    {
+        "age": 20 + 7 * i,
+        "gender": ("Male", "Female")[i % 2],
+        "race": "Other Hispanic",
+        "weight": 50.0 + 6.5 * i,
+        "height": 150.0 + 4.5 * i,
+        "education": "High school graduate",
+        "marital_status": "Never married",
+        "country_of_birth": ("US", "Other")[i % 2]
+    }
+    for i in range(8)
+]
+
+def _post_concurrently(client, profiles):
+    with ThreadPoolExecutor(max_workers=len(profiles)) as pool:
+        return list(pool.map(lambda profile: client.post("/api/predict", json=profile), profiles))
+
+def test_batched_predictions_match_single_profile_predictions(client, monkeypatch):
+    predictor = client.app.state.predictor
+    predict_batch = predictor.predict_batch
+    batch_sizes = []
+
+    def recording_predict_batch(profiles):
+        batch_sizes.append(len(profiles))
+        return predict_batch(profiles)
+
+    # Hold the batch window open long enough for every request to join
+    monkeypatch.setattr(client.app.state.batcher, "max_wait", 0.5)
+    monkeypatch.setattr(predictor, "predict_batch", recording_predict_batch)
+    responses = _post_concurrently(client, PROFILES)
+
+    assert sum(batch_sizes) == len(PROFILES)
+    assert max(batch_sizes) > 1
+    for profile, response in zip(PROFILES, responses):
+        assert response.status_code == 200
+        predictions, top_features, _ = predict_batch([UserProfile(**profile)])[0]
+        assert response.json()["predictions"] == [p.model_dump(mode="json") for p in predictions]
+        assert response.json()["top_features"] == [f.model_dump(mode="json") for f in top_features]
+
+def test_failed_batch_fails_every_waiting_request(client, monkeypatch):
+    def failing_predict_batch(profiles):
+        raise ValueError("inference failed")
+
+    monkeypatch.setattr(client.app.state.batcher, "max_wait", 0.5)
+    monkeypatch.setattr(client.app.state.predictor, "predict_batch", failing_predict_batch)
+    profiles = [{**profile, "age": profile["age"] + 1} for profile in PROFILES]
+    responses = _post_concurrently(client, profiles)
+
+    for response in responses:
+        assert response.status_code == 500
+        assert response.json()["detail"] == "Prediction error: inference failed"
@@ -0,0 +1,41 @@
+from pathlib import Path
+import joblib
+import numpy as np
+import pytest
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.datasets import make_classification
+from sklearn.linear_model import LogisticRegression
+from xgboost import XGBClassifier
+from app.models import FastCalibratedClassifier
+
+MODEL_DIR = Path(__file__).parent.parent / "saved_models"
+
+def _features(n_features: int) -> np.ndarray:
+    return np.random.default_rng(0).normal(scale=2.0, size=(5000, n_features))
+
+@pytest.mark.parametrize("nutrient", ["b12_deficient", "iron_deficient", "diabetes_risk"])
+def test_matches_shipped_calibrated_models(nutrient):
+    model = joblib.load(MODEL_DIR / f"{nutrient}_calibrated_model.pkl")
+    fast_model = FastCalibratedClassifier.from_model(model)
+    X = _features(model.n_features_in_)
+
+    assert fast_model is not None
+    expected = model.predict_proba(X)
+    np.testing.assert_array_equal(fast_model.predict_proba(X), expected)
+    np.testing.assert_array_equal(fast_model.predict_positive_with_raw(X)[0], expected[:, 1])
+
+def test_matches_sigmoid_calibration():
+    X, y = make_classification(n_samples=600, n_features=8, random_state=0)
+    model = CalibratedClassifierCV(
+        XGBClassifier(n_estimators=20, max_depth=3), method="sigmoid", cv=3
+    ).fit(X, y)
+    fast_model = FastCalibratedClassifier.from_model(model)
+
+    assert fast_model is not None
+    np.testing.assert_array_equal(fast_model.predict_proba(X), model.predict_proba(X))
+
+def test_unsupported_estimator_is_not_converted():
+    X, y = make_classification(n_samples=300, n_features=8, random_state=0)
+    model = CalibratedClassifierCV(LogisticRegression(), cv=3).fit(X, y)
+
+    assert FastCalibratedClassifier.from_model(model) is None
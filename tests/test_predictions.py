@@ -0,0 +1,24 @@
+import pytest
+
+PROFILE = {
+    "age": 35,
+    "gender": "Female",
+    "race": "Non-Hispanic White",
+    "weight": 65.0,
+    "height": 165.0,
+    "education": "College graduate or above",
+    "marital_status": "Married",
+    "country_of_birth": "US"
+}
+
+@pytest.mark.parametrize("field, value", [
+    ("weight", 30.04),
+    ("weight", 299.96),
+    ("height", 100.04),
+    ("height", 249.96),
+])
+def test_predict_accepts_values_rounding_to_range_bounds(client, field, value):
+    response = client.post("/api/predict", json={**PROFILE, field: value})
+
+    assert response.status_code == 200
+    assert len(response.json()["predictions"]) == 3
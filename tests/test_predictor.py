@@ -0,0 +1,62 @@
+from functools import partial
+from pathlib import Path
+import numpy as np
+import pytest
+from app.models import NutrientPredictor
+from app.schemas import UserProfile
+
+MODEL_DIR = Path(__file__).parent.parent / "saved_models"
+
+PROFILE = UserProfile(
+    age=50,
+    gender="Male",
+    race="Non-Hispanic White",
+    weight=80.0,
+    height=170.0,
+    education="Some college",
+    marital_status="Married",
+    country_of_birth="US"
+)
+
+def test_feature_info_is_empty_when_models_fail_to_load(tmp_path):
+    predictor = NutrientPredictor(tmp_path)
+
+    assert not predictor.load_models()
+    assert predictor.get_feature_info() == {"features": [], "total_features": 0}
+
+@pytest.fixture(scope="module")
+def predictor():
+    predictor = NutrientPredictor(MODEL_DIR)
+    assert predictor.load_models()
+    return predictor
+
+def _folds_uncalibrated_proba(calibrated_model, features_scaled):
+    """Mean positive probability of the estimators the calibrators were fitted on"""
+    return np.mean([
+        calibrated.estimator.predict_proba(features_scaled)[:, 1]
+        for calibrated in calibrated_model.calibrated_classifiers_
+    ], axis=0)
+
+def test_confidence_interval_is_built_from_calibration_folds(predictor):
+    features = predictor.create_feature_vector(PROFILE)
+    predictions, _, _ = predictor.predict_batch([PROFILE])[0]
+
+    for nutrient, prediction in zip(predictor.nutrients, predictions):
+        features_scaled = predictor.scalers[nutrient].transform(features)
+        proba = prediction.risk_score
+        uncalibrated = _folds_uncalibrated_proba(predictor.calibrated_models[nutrient], features_scaled)[0]
+        uncertainty = abs(proba - uncalibrated) + 0.05
+
+        assert prediction.confidence_lower == pytest.approx(max(0.0, proba - uncertainty))
+        assert prediction.confidence_upper == pytest.approx(min(1.0, proba + uncertainty))
+
+def test_sklearn_fallback_matches_fast_path(predictor, monkeypatch):
+    expected, _, _ = predictor.predict_batch([PROFILE])[0]
+
+    monkeypatch.setattr(predictor, "_probability_steps", [
+        partial(predictor._predict_with_calibration_folds, predictor.calibrated_models[nutrient])
+        for nutrient in predictor.nutrients
+    ])
+    predictions, _, _ = predictor.predict_batch([PROFILE])[0]
+
+    assert [p.model_dump() for p in predictions] == [p.model_dump() for p in expected]